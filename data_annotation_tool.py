@@ -5,16 +5,121 @@ import json
 import csv
 from datetime import datetime
 import random
+import sys
+from collections import Counter
+from itertools import islice
+
+try:
+    from statistics import fmean
+except ImportError:  # Python < 3.8
+    from statistics import mean as fmean
+
+# Buffer size for report and CSV files, so large exports coalesce writes
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Valid confidence levels, built once rather than on every check
+_CONFIDENCE_LEVELS = range(1, 6)
+
+
+def _check_complete(entry):
+    """Completeness criterion: every field has a value"""
+    if all(entry.values()):
+        return True, "✓ Complete"
+    return False, "✗ Missing data"
+
+
+def _check_format(entry):
+    """Format criterion: image_id is a string"""
+    if isinstance(entry.get('image_id'), str):
+        return True, "✓ Correct format"
+    return False, "✗ Format issue"
+
+
+def _check_consistency(entry):
+    """Consistency criterion: confidence is on the 1-5 scale"""
+    if entry.get('confidence') in _CONFIDENCE_LEVELS:
+        return True, "✓ Consistent"
+    return False, "✗ Inconsistent value"
+
 
 class DataAnnotationTool:
     """Main class for data annotation and quality assessment"""
     
-    def __init__(self):
-        self.annotations = []
+    # Column order used for CSV export
+    FIELDNAMES = ('image_id', 'category', 'confidence', 'timestamp', 'notes')
+    
+    # Reports with more annotations than this are streamed to disk
+    REPORT_STREAM_THRESHOLD = 10_000
+    
+    # Quality criteria handlers, each returning (passed, feedback)
+    _CRITERIA = {
+        'completeness': _check_complete,
+        'format': _check_format,
+        'consistency': _check_consistency
+    }
+    
+    def __init__(self, verbose=True, return_dicts=True):
+        """
+        Args:
+            verbose: Print progress messages from every tool method
+            return_dicts: Return a dictionary from annotate_image (None otherwise)
+        """
+        self.verbose = verbose
+        self.return_dicts = return_dicts
+        # Annotations are stored column-wise, one list per field
+        self._image_ids = []
+        self._categories = []
+        self._confidences = []
+        self._timestamps = []
+        self._notes = []
         self.quality_scores = []
         self.comparison_results = []
+        # Running totals for the average quality score
+        self._qs_sum = 0.0
+        self._qs_count = 0
+    
+    def _annotation_dicts(self):
+        """Yield each stored annotation as a new plain dictionary"""
+        for image_id, category, confidence, timestamp, notes in zip(
+            self._image_ids, self._categories, self._confidences,
+            self._timestamps, self._notes
+        ):
+            yield {
+                'image_id': image_id,
+                'category': category,
+                'confidence': confidence,
+                'timestamp': timestamp,
+                'notes': notes
+            }
+    
+    @property
+    def annotations(self):
+        """
+        All annotations as a list of dictionaries
+        
+        Annotations are stored column-wise, so this builds a new list on
+        every access. It is a copy: editing it does not change the stored
+        annotations, use annotate_image to add new ones.
+        """
+        return list(self._annotation_dicts())
+    
+    @property
+    def average_quality(self):
+        """
+        Average quality percentage across all checks, or None if none were run
         
-    def annotate_image(self, image_id, category, confidence, notes=""):
+        Kept as a running total; if quality_scores was added to or removed
+        from directly, the totals are rebuilt from the list. Editing the
+        percentage of an existing entry in place is not detected.
+        """
+        if self._qs_count != len(self.quality_scores):
+            self._qs_sum = sum(q['percentage'] for q in self.quality_scores)
+            self._qs_count = len(self.quality_scores)
+        if not self._qs_count:
+            return None
+        return self._qs_sum / self._qs_count
+        
+    def annotate_image(self, image_id, category, confidence, notes="", timestamp=None):
         """
         Annotate an image with category and confidence level
         
@@ -23,17 +128,58 @@ class DataAnnotationTool:
             category: Classification category (e.g., 'vehicle', 'person', 'animal')
             confidence: Confidence level (1-5 scale)
             notes: Optional notes about the annotation
+            timestamp: Optional ISO timestamp (defaults to the current time)
+        
+        Returns:
+            The annotation as a dictionary (a copy; editing it does not change
+            the stored annotation), or None when return_dicts is off
         """
-        annotation = {
-            'image_id': image_id,
-            'category': category,
-            'confidence': confidence,
-            'timestamp': datetime.now().isoformat(),
-            'notes': notes
-        }
-        self.annotations.append(annotation)
-        print(f"✓ Annotated image {image_id} as '{category}' (confidence: {confidence}/5)")
-        return annotation
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        # Categories repeat heavily; interning shares one string per label
+        if isinstance(category, str):
+            category = sys.intern(category)
+        self._image_ids.append(image_id)
+        self._categories.append(category)
+        self._confidences.append(confidence)
+        self._timestamps.append(timestamp)
+        self._notes.append(notes)
+        
+        if self.verbose:
+            print(f"✓ Annotated image {image_id} as '{category}' (confidence: {confidence}/5)")
+        
+        # Storage is column-wise, so only build the dict if the caller wants it
+        if self.return_dicts:
+            return {
+                'image_id': image_id,
+                'category': category,
+                'confidence': confidence,
+                'timestamp': timestamp,
+                'notes': notes
+            }
+        return None
+    
+    def bulk_annotate(self, records):
+        """
+        Annotate a batch of images sharing a single timestamp
+        
+        Args:
+            records: Iterable of dictionaries with 'id', 'category',
+                'confidence' and optional 'notes' keys
+        
+        Returns:
+            List of annotation dictionaries, or None when return_dicts is off
+        """
+        timestamp = datetime.now().isoformat()
+        annotations = [] if self.return_dicts else None
+        for record in records:
+            annotation = self.annotate_image(
+                record['id'], record['category'], record['confidence'],
+                record.get('notes', ""), timestamp
+            )
+            if annotations is not None:
+                annotations.append(annotation)
+        return annotations
     
     def quality_check(self, data_entry, criteria):
         """
@@ -48,26 +194,12 @@ class DataAnnotationTool:
         feedback = []
         
         for criterion in criteria:
-            if criterion == 'completeness':
-                if all(data_entry.values()):
-                    score += 1
-                    feedback.append("✓ Complete")
-                else:
-                    feedback.append("✗ Missing data")
-                    
-            elif criterion == 'format':
-                if isinstance(data_entry.get('image_id'), str):
-                    score += 1
-                    feedback.append("✓ Correct format")
-                else:
-                    feedback.append("✗ Format issue")
-                    
-            elif criterion == 'consistency':
-                if data_entry.get('confidence') in range(1, 6):
-                    score += 1
-                    feedback.append("✓ Consistent")
-                else:
-                    feedback.append("✗ Inconsistent value")
+            check = self._CRITERIA.get(criterion)
+            if check is None:
+                continue
+            passed, message = check(data_entry)
+            score += passed
+            feedback.append(message)
         
         quality_result = {
             'data_entry': data_entry,
@@ -79,7 +211,10 @@ class DataAnnotationTool:
         }
         
         self.quality_scores.append(quality_result)
-        print(f"Quality Score: {score}/{max_score} ({quality_result['percentage']:.1f}%)")
+        self._qs_sum += quality_result['percentage']
+        self._qs_count += 1
+        if self.verbose:
+            print(f"Quality Score: {score}/{max_score} ({quality_result['percentage']:.1f}%)")
         return quality_result
     
     def pairwise_comparison(self, item_a, item_b, criterion):
@@ -91,57 +226,71 @@ class DataAnnotationTool:
             item_b: Second item to compare
             criterion: Criterion for comparison (e.g., 'quality', 'accuracy', 'completeness')
         """
-        print(f"\n--- Pairwise Comparison: {criterion} ---")
-        print(f"Item A: {item_a}")
-        print(f"Item B: {item_b}")
+        return self.pairwise_comparison_batch([(item_a, item_b)], criterion)[0]
+    
+    def pairwise_comparison_batch(self, pairs, criterion):
+        """
+        Compare several pairs of items on the same criterion
         
+        Args:
+            pairs: Sequence of (item_a, item_b) tuples to compare
+            criterion: Criterion for comparison (e.g., 'quality', 'accuracy', 'completeness')
+        """
         # Simulated comparison logic (in real use, human judgment would be applied)
-        winner = random.choice(['A', 'B', 'Tie'])
+        winners = random.choices(('A', 'B', 'Tie'), k=len(pairs))
+        timestamp = datetime.now().isoformat()
         
-        comparison = {
-            'item_a': item_a,
-            'item_b': item_b,
-            'criterion': criterion,
-            'winner': winner,
-            'timestamp': datetime.now().isoformat()
-        }
+        comparisons = [
+            {
+                'item_a': item_a,
+                'item_b': item_b,
+                'criterion': criterion,
+                'winner': winner,
+                'timestamp': timestamp
+            }
+            for (item_a, item_b), winner in zip(pairs, winners)
+        ]
         
-        self.comparison_results.append(comparison)
-        print(f"Result: Item {winner} is better for '{criterion}'")
-        return comparison
+        self.comparison_results.extend(comparisons)
+        if self.verbose:
+            for comparison in comparisons:
+                print(f"\n--- Pairwise Comparison: {criterion} ---")
+                print(f"Item A: {comparison['item_a']}")
+                print(f"Item B: {comparison['item_b']}")
+                print(f"Result: Item {comparison['winner']} is better for '{criterion}'")
+        return comparisons
     
     def consistency_check(self):
         """Check consistency across all annotations"""
-        if len(self.annotations) < 2:
-            print("Need at least 2 annotations for consistency check")
+        if len(self._categories) < 2:
+            if self.verbose:
+                print("Need at least 2 annotations for consistency check")
             return None
         
-        categories = [a['category'] for a in self.annotations]
-        confidences = [a['confidence'] for a in self.annotations]
+        categories = self._categories
+        confidences = self._confidences
+        category_distribution = dict(Counter(categories))
+        unique_categories = len(category_distribution)
         
         consistency_report = {
-            'total_annotations': len(self.annotations),
-            'unique_categories': len(set(categories)),
-            'avg_confidence': sum(confidences) / len(confidences),
+            'total_annotations': len(categories),
+            'unique_categories': unique_categories,
+            'avg_confidence': fmean(confidences),
             'consistency_score': None
         }
         
-        # Calculate consistency score
-        category_distribution = {}
-        for cat in categories:
-            category_distribution[cat] = category_distribution.get(cat, 0) + 1
-        
         # Higher consistency if categories are well distributed
         consistency_report['category_distribution'] = category_distribution
         consistency_report['consistency_score'] = (
-            len(set(categories)) / len(categories) * 100
+            unique_categories / len(categories) * 100
         )
         
-        print("\n=== Consistency Report ===")
-        print(f"Total Annotations: {consistency_report['total_annotations']}")
-        print(f"Unique Categories: {consistency_report['unique_categories']}")
-        print(f"Average Confidence: {consistency_report['avg_confidence']:.2f}/5")
-        print(f"Category Distribution: {category_distribution}")
+        if self.verbose:
+            print("\n=== Consistency Report ===")
+            print(f"Total Annotations: {consistency_report['total_annotations']}")
+            print(f"Unique Categories: {consistency_report['unique_categories']}")
+            print(f"Average Confidence: {consistency_report['avg_confidence']:.2f}/5")
+            print(f"Category Distribution: {category_distribution}")
         
         return consistency_report
     
@@ -149,48 +298,65 @@ class DataAnnotationTool:
         """Generate comprehensive report of all annotation work"""
         report = {
             'summary': {
-                'total_annotations': len(self.annotations),
+                'total_annotations': len(self._image_ids),
                 'total_quality_checks': len(self.quality_scores),
                 'total_comparisons': len(self.comparison_results),
                 'generated_at': datetime.now().isoformat()
             },
-            'annotations': self.annotations,
+            'annotations': list(self._annotation_dicts()),
             'quality_scores': self.quality_scores,
             'comparisons': self.comparison_results
         }
         
         # Calculate overall quality
-        if self.quality_scores:
-            avg_quality = sum(q['percentage'] for q in self.quality_scores) / len(self.quality_scores)
+        avg_quality = self.average_quality
+        if avg_quality is not None:
             report['summary']['average_quality_score'] = f"{avg_quality:.2f}%"
         
-        # Save to JSON
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Save to JSON: large reports are encoded straight into a buffered
+        # file so the full JSON text is never held in memory (the report
+        # dicts themselves still are); small ones get a single write
+        if len(self._image_ids) > self.REPORT_STREAM_THRESHOLD:
+            with open(filename, 'w', buffering=_WRITE_BUFFER_SIZE) as f:
+                json.dump(report, f, indent=2)
+        else:
+            data = json.dumps(report, indent=2)
+            with open(filename, 'w') as f:
+                f.write(data)
         
-        print(f"\n✓ Report saved to {filename}")
+        if self.verbose:
+            print(f"\n✓ Report saved to {filename}")
         return report
     
     def export_to_csv(self, filename='annotations.csv'):
         """Export annotations to CSV format"""
-        if not self.annotations:
-            print("No annotations to export")
+        if not self._image_ids:
+            if self.verbose:
+                print("No annotations to export")
             return
         
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.annotations[0].keys())
-            writer.writeheader()
-            writer.writerows(self.annotations)
+        with open(filename, 'w', newline='', buffering=_WRITE_BUFFER_SIZE,
+                  encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDNAMES)
+            writer.writerows(zip(
+                self._image_ids, self._categories, self._confidences,
+                self._timestamps, self._notes
+            ))
         
-        print(f"✓ Annotations exported to {filename}")
+        if self.verbose:
+            print(f"✓ Annotations exported to {filename}")
 
 
 def demo_workflow():
     """Demonstrate a complete data annotation workflow"""
-    print("=" * 60)
-    print("AI DATA ANNOTATION & QUALITY ASSESSMENT TOOL")
-    print("Portfolio Project by Mitchele Jebet")
-    print("=" * 60)
+    sys.stdout.write("\n".join([
+        "=" * 60,
+        "AI DATA ANNOTATION & QUALITY ASSESSMENT TOOL",
+        "Portfolio Project by Mitchele Jebet",
+        "=" * 60,
+        ""
+    ]))
     
     tool = DataAnnotationTool()
     
@@ -204,7 +370,7 @@ def demo_workflow():
     
     # Quality assessment
     print("\n--- TASK 2: Quality Assessment ---")
-    for annotation in tool.annotations[:3]:
+    for annotation in islice(tool._annotation_dicts(), 3):
         tool.quality_check(
             annotation, 
             ['completeness', 'format', 'consistency']
@@ -232,27 +398,32 @@ def demo_workflow():
     report = tool.generate_report()
     tool.export_to_csv()
     
-    # Display summary statistics
-    print("\n" + "=" * 60)
-    print("SUMMARY STATISTICS")
-    print("=" * 60)
-    print(f"Total Annotations: {len(tool.annotations)}")
-    print(f"Quality Checks Performed: {len(tool.quality_scores)}")
-    print(f"Comparisons Completed: {len(tool.comparison_results)}")
+    # Display summary statistics (collected and written in one go)
+    summary = report['summary']
+    out = [
+        "\n" + "=" * 60,
+        "SUMMARY STATISTICS",
+        "=" * 60,
+        f"Total Annotations: {summary['total_annotations']}",
+        f"Quality Checks Performed: {summary['total_quality_checks']}",
+        f"Comparisons Completed: {summary['total_comparisons']}"
+    ]
     
-    if tool.quality_scores:
-        avg_quality = sum(q['percentage'] for q in tool.quality_scores) / len(tool.quality_scores)
-        print(f"Average Quality Score: {avg_quality:.2f}%")
+    avg_quality = tool.average_quality
+    if avg_quality is not None:
+        out.append(f"Average Quality Score: {avg_quality:.2f}%")
     
-    print("\n✓ Demo completed successfully!")
-    print("Files generated: annotation_report.json, annotations.csv")
-    print("=" * 60)
+    out.append("\n✓ Demo completed successfully!")
+    out.append("Files generated: annotation_report.json, annotations.csv")
+    out.append("=" * 60)
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 # Example usage for custom annotation tasks
 def custom_annotation_example():
     """Example of how to use the tool for custom tasks"""
-    tool = DataAnnotationTool()
+    tool = DataAnnotationTool(verbose=False, return_dicts=False)
     
     # Custom image annotations
     images_to_annotate = [
@@ -261,8 +432,7 @@ def custom_annotation_example():
         {"id": "IMG_102", "category": "food", "confidence": 5},
     ]
     
-    for img in images_to_annotate:
-        tool.annotate_image(img["id"], img["category"], img["confidence"])
+    tool.bulk_annotate(images_to_annotate)
     
     # Generate report
     tool.generate_report('custom_report.json')